@@ -1,37 +1,44 @@
 #!/usr/bin/env python3
 
-import json
-import os
-import random
+from crossword_generator import load_word_hints
 
-# Load the word hints from the JSON file
-with open('word_hints.json', 'r', encoding='utf-8') as f:
-    word_hints = json.load(f)
+# Only words made of these characters are usable in the crossword
+VALID_CHARS = 'abcdefghijklmnopqrstuvwxyzäö'
+DROP_VALID = str.maketrans('', '', VALID_CHARS)
+
+# Load the word hints (from a pickled copy when it is up to date)
+word_hints = load_word_hints('word_hints.json')
 
 print(f"Loaded {len(word_hints)} hints from word_hints.json")
 
-# Read the current word file
-with open('finnish_words.txt', 'r', encoding='utf-8') as f:
-    words = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+# Read the current word file in one call and decode it once
+with open('finnish_words.txt', 'rb', buffering=1 << 17) as f:
+    raw = f.read().decode('utf-8')
+words = [line.strip() for line in raw.splitlines() if line.strip() and not line.startswith('#')]
+
+# Drop words with characters the crossword cannot use (e.g. hyphens)
+words = [word for word in words if not word.lower().translate(DROP_VALID)]
 
 print(f"Loaded {len(words)} words from finnish_words.txt")
 
-# Create a new file with hints
-with open('finnish_words_with_hints.txt', 'w', encoding='utf-8') as f:
-    for word in words:
-        word_lower = word.lower()
-        if word_lower in word_hints:
-            # Add the hint to the word
-            f.write(f"{word}: {word_hints[word_lower]}\n")
-        else:
-            # Keep the word without a hint
-            f.write(f"{word}\n")
+# Build the new file contents with hints
+lines = []
+hints_count = 0
+get_hint = word_hints.get  # Bound once; one hash lookup per word
+for word in words:
+    hint = get_hint(word.lower())
+    if hint is not None:
+        # Add the hint to the word
+        lines.append(f"{word}: {hint}\n")
+        hints_count += 1
+    else:
+        # Keep the word without a hint
+        lines.append(f"{word}\n")
+
+# Write everything in one call through a large buffer
+with open('finnish_words_with_hints.txt', 'w', encoding='utf-8', buffering=1 << 20, newline='\n') as f:
+    f.writelines(lines)
 
 print(f"Created finnish_words_with_hints.txt with hints for words found in word_hints.json")
 
-# Count how many words have hints
-with open('finnish_words_with_hints.txt', 'r', encoding='utf-8') as f:
-    lines = f.readlines()
-    hints_count = sum(1 for line in lines if ':' in line)
-
 print(f"Added hints to {hints_count} out of {len(words)} words ({(hints_count/len(words))*100:.2f}%)")
@@ -1,9 +1,9 @@
 #!/usr/bin/env python3
 
-import json
-import os
 import random
 
+from crossword_generator import load_word_hints
+
 # Define some generic hint templates
 generic_hints = [
     "A common Finnish word",
@@ -26,15 +26,17 @@ categories = [
     "communication", "transportation", "clothing", "health", "art"
 ]
 
-# Load the existing word hints from the JSON file
-with open('word_hints.json', 'r', encoding='utf-8') as f:
-    existing_hints = json.load(f)
+# Pair each template with whether it has a slot for a category
+TEMPLATES = [(template, '{}' in template) for template in generic_hints]
+
+# Load the existing word hints (from a pickled copy when it is up to date)
+existing_hints = load_word_hints('word_hints.json')
 
 print(f"Loaded {len(existing_hints)} existing hints from word_hints.json")
 
-# Read the current word file with hints
-with open('finnish_words_with_hints.txt', 'r', encoding='utf-8') as f:
-    lines = f.readlines()
+# Read the current word file with hints in one call and decode it once
+with open('finnish_words_with_hints.txt', 'rb', buffering=1 << 17) as f:
+    lines = f.read().decode('utf-8').splitlines(keepends=True)
 
 # Count words with and without hints
 words_with_hints = [line.strip() for line in lines if ':' in line]
@@ -46,6 +48,15 @@ print(f"Found {len(words_with_hints)} words with hints and {len(words_without_hi
 num_words_to_add_hints = min(100, len(words_without_hints))
 words_to_add_hints = random.sample(words_without_hints, num_words_to_add_hints)
 
+# Draw all templates and categories up front and map each word to its hint.
+# The dict also keeps the membership test in the write loop O(1).
+picked_templates = random.choices(TEMPLATES, k=num_words_to_add_hints)
+picked_categories = random.choices(categories, k=num_words_to_add_hints)
+new_hints = {}
+for i, word in enumerate(words_to_add_hints):
+    hint_template, has_slot = picked_templates[i]
+    new_hints[word] = hint_template.format(picked_categories[i]) if has_slot else hint_template
+
 # Create a new file with additional hints
 with open('finnish_words_with_more_hints.txt', 'w', encoding='utf-8') as f:
     # First write all words that already have hints
@@ -54,12 +65,9 @@ with open('finnish_words_with_more_hints.txt', 'w', encoding='utf-8') as f:
             f.write(line)
         else:
             word = line.strip()
-            if word in words_to_add_hints:
-                # Generate a random hint for this word
-                category = random.choice(categories)
-                hint_template = random.choice(generic_hints)
-                hint = hint_template.format(category) if '{}' in hint_template else hint_template
-                f.write(f"{word}: {hint}\n")
+            if word in new_hints:
+                # Use the hint generated for this word
+                f.write(f"{word}: {new_hints[word]}\n")
             else:
                 # Keep the word without a hint
                 f.write(line)
@@ -1,195 +1,315 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, current_app, render_template, request, jsonify
+from flask.json.provider import JSONProvider
+from flask.logging import default_handler
+from flask_caching import Cache
+import orjson
+import functools
+import io
 import os
-import json
-import traceback
+import logging
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 from crossword_generator import CrosswordGenerator
 
-app = Flask(__name__)
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson, which serializes the grid in C."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response, skipping a decode
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype='application/json')
+
+# Same logger as app.logger, but usable from worker processes and outside an
+# application context. Named explicitly: run as a script this module is
+# '__main__', while Flask still names app.logger after the file ('app')
+logger = logging.getLogger('app')
+
+# Generated puzzles are kept on disk so every worker process can reuse them
+cache = Cache()
+CACHE_CONFIG = {
+    'CACHE_TYPE': 'FileSystemCache',
+    'CACHE_DIR': '.puzzle_cache',
+    'CACHE_DEFAULT_TIMEOUT': 3600
+}
+
+# Word files to try for each language, first existing one is used
+LANG_FILES = {
+    'fi': ('finnish_words_with_hints.txt', 'finnish_words.txt'),
+    'no': ('norwegian_words_with_hints.txt',),
+}
+
+# Valid characters for each word list, built once instead of per line
+LANG_ALPHABET = {
+    'fi': frozenset('abcdefghijklmnopqrstuvwxyzäö'),
+    'no': frozenset('abcdefghijklmnopqrstuvwxyzåøæ'),
+}
+
+# Deletion tables: a lowercased word is valid if nothing is left after translate
+LANG_DROP = {lang: str.maketrans('', '', ''.join(chars)) for lang, chars in LANG_ALPHABET.items()}
+
+# Limit number of words to process per language (None = no limit)
+LANG_MAX_WORDS = {'fi': 200, 'no': None}
+
+def _read_lines(path):
+    """Read a word file in one call and decode it once."""
+    with io.open(path, 'rb', buffering=1 << 17) as f:
+        data = f.read()
+    return data.decode('utf-8').splitlines()
+
+@functools.lru_cache(maxsize=4)
+def load_wordlist(language):
+    """Load the word list and hints for a language.
+
+    The result is cached per language so word files are parsed once per
+    process instead of on every request.
+    """
+    words = []
+    word_hints = {}
+    targets = ['fi', 'no'] if language == 'both' else [language]
+
+    for lang in targets:
+        word_file = next((path for path in LANG_FILES.get(lang, ()) if os.path.exists(path)), None)
+        if word_file is None:
+            logger.warning("No word file found for language %r", lang)
+            continue
+        logger.debug("Using word file: %s", word_file)
+
+        drop_invalid = LANG_DROP[lang]
+        max_words = LANG_MAX_WORDS[lang]
+        count = 0
+
+        # Process each line in the word file
+        for line in _read_lines(word_file):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            # Check if line contains a hint (format: word: hint)
+            head, sep, tail = line.partition(':')  # Split only on first colon
+            word = head.strip()
+            word_lower = word.lower()
+
+            # Skip very short words and words with invalid characters
+            if len(word) < 3 or word_lower.translate(drop_invalid):
+                continue
+
+            # Only keep hints for words that are actually used
+            words.append(word)
+            if sep:
+                word_hints[word_lower] = tail.strip()
+            count += 1
+            if count == max_words:
+                break
+
+        logger.debug("Loaded %d words from %s", count, word_file)
+
+    return frozenset(words), dict(word_hints)
+
+@cache.memoize(timeout=3600)
+def build_puzzle(width, height, language, seed):
+    """Generate a puzzle for the given settings.
+
+    Memoized on (width, height, language, seed), so a seeded request that
+    was already answered is served from the cache.
+    """
+    words, word_hints = load_wordlist(language)
+
+    # Create generator with loaded words
+    generator = CrosswordGenerator(width=width, height=height, language=language, seed=seed)
+    generator.words = words
+
+    # Set the word hints in the generator
+    generator.word_hints = word_hints
+    logger.debug("Word hints loaded: %d", len(generator.word_hints))
+
+    logger.debug("Starting puzzle generation with %d words", len(generator.words))
+    logger.debug("Grid dimensions: width=%d, height=%d", generator.width, generator.height)
+    grid, across, down, across_hints, down_hints, answer_key = generator.generate_puzzle()
+    logger.debug("Placed %d across and %d down words", len(across_hints), len(down_hints))
+
+    # generate_puzzle already returns JSON-ready cells
+    # ({'letter', 'number', 'empty'}), so the grid is sent as-is
+    return {
+        'grid': grid,
+        'across': across,
+        'down': down,
+        'across_hints': across_hints,
+        'down_hints': down_hints,
+        'answer_key': answer_key
+    }
+
+# Seconds a background job result is kept in the cache
+JOB_TIMEOUT = 3600
+
+# Seconds after which a job still pending is reported as failed. Results are
+# stored by the web worker that started the job, so a job whose web worker
+# was restarted would otherwise stay pending until JOB_TIMEOUT. Generation
+# takes seconds, so this leaves plenty of room for jobs queued in the pool
+JOB_STALE_AFTER = 600
+
+# Web worker processes (gunicorn's WEB_CONCURRENCY, default one per CPU)
+# and puzzle worker processes each of them starts, so that all pools
+# together use about one process per CPU
+WEB_WORKERS = int(os.environ.get('WEB_CONCURRENCY') or os.cpu_count() or 1)
+POOL_WORKERS = max(1, (os.cpu_count() or 1) // WEB_WORKERS)
+
+# Worker processes for /generate_async, created on first use; the lock keeps
+# concurrent request threads from starting two pools
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor():
+    """Return the puzzle worker pool, starting it on first use.
+
+    Workers come from a forkserver rather than a fork of this process: the
+    web worker runs request threads, and a forked child could inherit a lock
+    (logging, cache I/O) that another thread was holding and never get it.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=POOL_WORKERS,
+                                            mp_context=multiprocessing.get_context('forkserver'))
+    return _executor
+
+def _generate_job(width, height, language, seed):
+    """Generate a puzzle inside a worker process."""
+    return build_puzzle.uncached(width, height, language, seed)
+
+def _store_job_result(app, job_id, future):
+    """Store a finished job in the shared cache so any web worker can serve it."""
+    try:
+        job = {'status': 'done', 'puzzle': future.result()}
+    except Exception as e:
+        logger.exception("Error in background generate_puzzle")
+        job = {'status': 'error', 'error': f'Failed to generate puzzle: {str(e)}'}
+    # Runs on the executor's callback thread, outside any request
+    with app.app_context():
+        cache.set(f'job:{job_id}', job, timeout=JOB_TIMEOUT)
+
+def _parse_puzzle_request(data):
+    """Return (width, height, language, seed) from a /generate request body."""
+    size_input = data.get('size', '15')  # Get size as string (may include dimensions like '25x15')
+    language = data.get('language', 'fi')  # Default to Finnish
+    seed = data.get('seed')  # Optional, makes the puzzle reproducible
+    if seed is not None:
+        seed = int(seed)
+
+    # Parse size - could be a number or 'WIDTHxHEIGHT' format
+    if 'x' in size_input:
+        width, height = map(int, size_input.split('x'))
+    else:
+        width = height = int(size_input)  # Square grid
+    return width, height, language, seed
+
+def _word_list_error(language):
+    """Return an error response if the word list can't be used, else None."""
+    try:
+        words, word_hints = load_wordlist(language)
+    except Exception:
+        logger.exception("Error loading words")
+        return jsonify({'error': 'Failed to load word list'}), 500
+
+    if not words:
+        return jsonify({'error': 'No words loaded'}), 500
+    return None
 
-@app.route('/')
 def index():
     return render_template('index.html')
 
-@app.route('/generate', methods=['POST'])
 def generate():
     try:
-        data = request.get_json()
-        size_input = data.get('size', '15')  # Get size as string (may include dimensions like '25x15')
-        language = data.get('language', 'fi')  # Default to Finnish
-        
-        # Parse size - could be a number or 'WIDTHxHEIGHT' format
-        if 'x' in size_input:
-            width, height = map(int, size_input.split('x'))
-        else:
-            width = height = int(size_input)  # Square grid
-        
-        # Load words
-        words = []
-        word_hints = {}
-        max_words = 200  # Limit number of words to process
-        
-        try:
-            if language in ['fi', 'both']:
-                # Use the single word file with hints
-                word_file = 'finnish_words_with_hints.txt' if os.path.exists('finnish_words_with_hints.txt') else 'finnish_words.txt'
-                print(f"Using word file: {word_file}")
-                
-                with open(word_file, 'r', encoding='utf-8') as f:
-                    # Process each line in the word file
-                    for line in f:
-                        if len(words) >= max_words:
-                            break
-                            
-                        line = line.strip()
-                        if not line or line.startswith('#'):
-                            continue
-                            
-                        # Check if line contains a hint (format: word: hint)
-                        if ':' in line:
-                            parts = line.split(':', 1)  # Split only on first colon
-                            word = parts[0].strip()
-                            if len(word) < 3:  # Skip very short words
-                                continue
-                            hint = parts[1].strip()
-                            word_hints[word.lower()] = hint
-                        else:
-                            word = line.strip()
-                            if len(word) < 3:  # Skip very short words
-                                continue
-                            
-                        # Basic validation: only include words with valid characters
-                        valid_chars = set('abcdefghijklmnopqrstuvwxyzäö')
-                        if all(c.lower() in valid_chars for c in word):
-                            words.append(word)
-                            
-                        # Debug: Print progress
-                        if len(words) % 50 == 0:
-                            print(f"Loaded {len(words)} words...")
-                                
-                print(f"Loaded {len(words)} Finnish words")
-                
-            if language in ['no', 'both']:
-                # Use the Norwegian word file with hints
-                word_file = 'norwegian_words_with_hints.txt' if os.path.exists('norwegian_words_with_hints.txt') else None
-                if word_file:
-                    print(f"Using Norwegian word file: {word_file}")
-                    
-                    with open(word_file, 'r', encoding='utf-8') as f:
-                        # Process each line in the word file
-                        for line in f:
-                            if line.strip() and not line.startswith('#'):
-                                # Check if line contains a hint (format: word: hint)
-                                if ':' in line:
-                                    parts = line.split(':', 1)  # Split only on first colon
-                                    word = parts[0].strip()
-                                    hint = parts[1].strip()
-                                    word_hints[word.lower()] = hint
-                                else:
-                                    word = line.strip()
-                                    
-                                # Basic validation: only include words with valid characters
-                                valid_chars = set('abcdefghijklmnopqrstuvwxyzåøæ')
-                                if all(c.lower() in valid_chars for c in word):
-                                    words.append(word)
-                    
-                    print(f"Loaded {len(words)} words total (Finnish and/or Norwegian)")
-                else:
-                    print("Norwegian word file not found")
-                    
-            # Print some sample hints
-            print("=== Sample hints from word file ===")
-            hint_count = 0
-            for word, hint in word_hints.items():
-                print(f"{word}: {hint}")
-                hint_count += 1
-                if hint_count >= 10:
-                    break
-        except Exception as e:
-            print(f"Error loading words: {e}")
-            return jsonify({'error': 'Failed to load word list'}), 500
-
-        if not words:
-            return jsonify({'error': 'No words loaded'}), 500
-
-        # Create generator with loaded words
-        generator = CrosswordGenerator(width=width, height=height, language=language)
-        generator.words = set(words)
-        
-        # Set the word hints in the generator
-        generator.word_hints = word_hints
-        
-        # Debug word hints
-        print(f"Word hints loaded: {len(generator.word_hints)}")
-        if generator.word_hints:
-            # Print a few examples
-            sample_keys = list(generator.word_hints.keys())[:5]
-            for key in sample_keys:
-                print(f"Sample hint: {key} -> {generator.word_hints[key]}")
-        else:
-            print("No word hints loaded!")
-
-        # Generate puzzle
+        width, height, language, seed = _parse_puzzle_request(request.get_json())
+
+        error = _word_list_error(language)
+        if error:
+            return error
+
+        # Generate puzzle; only seeded requests are reproducible, so only
+        # those go through the cache
         try:
-            print(f"Starting puzzle generation with {len(generator.words)} words")
-            print(f"Grid dimensions: width={generator.width}, height={generator.height}")
-            # Add traceback for easier debugging
-            import traceback
-            try:
-                grid, across, down, across_hints, down_hints, answer_key = generator.generate_puzzle()
-            except Exception as e:
-                print(f"Error in generate_puzzle with full traceback:\n{traceback.format_exc()}")
-                raise e
-            print(f"Grid dimensions: {len(grid)} x {len(grid[0]) if grid and len(grid) > 0 else 0}")
-            
-            # Debug output for hints
-            print("\n=== Hints for placed words ===")
-            print(f"Across hints: {len(across_hints)}")
-            for i, hint in enumerate(across_hints):
-                print(f"Across {i+1}: {across[i]} - {hint}")
-                
-            print(f"Down hints: {len(down_hints)}")
-            for i, hint in enumerate(down_hints):
-                print(f"Down {i+1}: {down[i]} - {hint}")
-            
+            if seed is None:
+                puzzle = build_puzzle.uncached(width, height, language, None)
+            else:
+                puzzle = build_puzzle(width, height, language, seed)
         except Exception as e:
-            print(f"Error in generate_puzzle: {e}")
-            traceback.print_exc()
+            logger.exception("Error in generate_puzzle")
             return jsonify({'error': f'Failed to generate puzzle: {str(e)}'}), 500
 
-        # Ensure grid is properly serialized for JSON
-        serialized_grid = []
-        if grid and isinstance(grid, list):
-            for row in grid:
-                if isinstance(row, list):
-                    serialized_row = []
-                    for cell in row:
-                        if isinstance(cell, dict):
-                            serialized_row.append({
-                                'letter': cell.get('letter', ' '),
-                                'number': cell.get('number'),
-                                'empty': cell.get('empty', False)
-                            })
-                        else:
-                            # Fallback for non-dict cells
-                            serialized_row.append({
-                                'letter': ' ',
-                                'number': None,
-                                'empty': True
-                            })
-                    serialized_grid.append(serialized_row)
-        
-        return jsonify({
-            'grid': serialized_grid,
-            'across': across,
-            'down': down,
-            'across_hints': across_hints,
-            'down_hints': down_hints,
-            'answer_key': answer_key
-        })
+        response = jsonify(puzzle)
+        if seed is not None:
+            response.cache_control.public = True
+            response.cache_control.max_age = 3600
+        return response
     except Exception as e:
-        print(f"Unexpected error: {e}")
-        traceback.print_exc()
+        logger.exception("Unexpected error")
         return jsonify({'error': str(e)}), 400
 
+def generate_async():
+    """Start generating a puzzle in a worker process and return its job id."""
+    try:
+        width, height, language, seed = _parse_puzzle_request(request.get_json())
+
+        error = _word_list_error(language)
+        if error:
+            return error
+
+        job_id = uuid.uuid4().hex
+        cache.set(f'job:{job_id}', {'status': 'pending', 'started': time.time()},
+                  timeout=JOB_TIMEOUT)
+        future = _get_executor().submit(_generate_job, width, height, language, seed)
+        app = current_app._get_current_object()
+        future.add_done_callback(functools.partial(_store_job_result, app, job_id))
+        return jsonify({'job_id': job_id}), 202
+    except Exception as e:
+        logger.exception("Unexpected error")
+        return jsonify({'error': str(e)}), 400
+
+def result(job_id):
+    """Poll a job started by /generate_async."""
+    job = cache.get(f'job:{job_id}')
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    if job['status'] == 'pending':
+        if time.time() - job['started'] > JOB_STALE_AFTER:
+            # The web worker running it is gone; nothing will store a result
+            return jsonify({'error': 'Puzzle generation was interrupted'}), 500
+        return jsonify({'status': 'pending'}), 202
+    if job['status'] == 'error':
+        return jsonify({'error': job['error']}), 500
+    return jsonify(job['puzzle'])
+
+def create_app():
+    """Create the Flask application with its JSON provider, cache and routes."""
+    app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+    # Production log level; per-request debug output is skipped entirely
+    app.logger.setLevel(logging.INFO)
+    # The generator logs to its own module logger; show it beside app.logger
+    generator_logger = logging.getLogger('crossword_generator')
+    generator_logger.setLevel(logging.INFO)
+    if not generator_logger.handlers:
+        generator_logger.addHandler(default_handler)
+    cache.init_app(app, config=CACHE_CONFIG)
+
+    app.add_url_rule('/', view_func=index)
+    app.add_url_rule('/generate', view_func=generate, methods=['POST'])
+    app.add_url_rule('/generate_async', view_func=generate_async, methods=['POST'])
+    app.add_url_rule('/result/<job_id>', view_func=result)
+    return app
+
+app = create_app()
+
 if __name__ == '__main__':
+    app.logger.setLevel(logging.DEBUG)
+    logging.getLogger('crossword_generator').setLevel(logging.DEBUG)
     app.run(debug=True, port=5014)
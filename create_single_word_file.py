@@ -1,31 +1,51 @@
 #!/usr/bin/env python3
 
-import json
-import os
+from crossword_generator import load_word_hints
 
-# Load the word hints from the JSON file
-with open('word_hints.json', 'r', encoding='utf-8') as f:
-    word_hints = json.load(f)
+# Only words made of these characters are usable in the crossword
+VALID_CHARS = 'abcdefghijklmnopqrstuvwxyzäö'
+
+# The word file is processed as UTF-8 bytes. Deleting every byte that can
+# appear in a valid word (either case) must leave nothing; once a word has
+# passed that check its only multi-byte letters are ä/ö/Ä/Ö, so a plain
+# byte table is enough to lowercase it.
+VALID_BYTES = (VALID_CHARS + VALID_CHARS.upper()).encode('utf-8')
+LOWER_BYTES = bytes.maketrans(VALID_CHARS.upper().encode('utf-8'), VALID_CHARS.encode('utf-8'))
+
+# Load the word hints (from a pickled copy when it is up to date)
+word_hints = load_word_hints('word_hints.json')
 
 print(f"Loaded {len(word_hints)} hints from word_hints.json")
 
-# Read the current word file
-with open('finnish_words.txt', 'r', encoding='utf-8') as f:
-    words = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+# Pre-encode the hints so the word loop never decodes or encodes
+hints_bytes = {k.encode('utf-8'): v.encode('utf-8') for k, v in word_hints.items()}
+
+# Read the current word file in one call and keep it as bytes
+with open('finnish_words.txt', 'rb', buffering=1 << 17) as f:
+    raw = f.read()
+words = [line.strip() for line in raw.splitlines() if line.strip() and not line.startswith(b'#')]
+
+# Drop words with characters the crossword cannot use (e.g. hyphens)
+words = [word for word in words if not word.translate(None, VALID_BYTES)]
 
 print(f"Loaded {len(words)} words from finnish_words.txt")
 
-# Create a new file with words and hints
-with open('finnish_words_with_hints.txt', 'w', encoding='utf-8') as f:
-    hint_count = 0
-    for word in words:
-        word_lower = word.lower()
-        if word_lower in word_hints:
-            # Add the hint to the word
-            f.write(f"{word}: {word_hints[word_lower]}\n")
-            hint_count += 1
-        else:
-            # Keep the word without a hint
-            f.write(f"{word}\n")
+# Build the new file contents with words and hints
+lines = []
+hint_count = 0
+get_hint = hints_bytes.get  # Bound once; one hash lookup per word
+for word in words:
+    hint = get_hint(word.translate(LOWER_BYTES))
+    if hint is not None:
+        # Add the hint to the word
+        lines.append(word + b': ' + hint + b'\n')
+        hint_count += 1
+    else:
+        # Keep the word without a hint
+        lines.append(word + b'\n')
+
+# Write everything in one call through a large buffer
+with open('finnish_words_with_hints.txt', 'wb', buffering=1 << 20) as f:
+    f.writelines(lines)
 
 print(f"Created finnish_words_with_hints.txt with hints for {hint_count} out of {len(words)} words")
@@ -1,11 +1,344 @@
 #!/usr/bin/env python3
 import argparse
+import functools
+import heapq
 import random
 import json
+import logging
 import os
-from typing import List, Tuple, Dict, Optional, Set
+import pickle
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import repeat
+from typing import List, Tuple, Dict, Optional, Set, FrozenSet
+
+# Progress and hint lookups go to debug; app.py sets the level and handler
+logger = logging.getLogger(__name__)
+
+# Byte value of an empty cell in the flat grid. Letters are stored as
+# latin-1 bytes, which covers Ä, Ö, Å, Ø and Æ in a single byte.
+EMPTY = ord(' ')
+
+# Letters allowed per language
+FI_CHARS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖ')
+NO_CHARS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZÅØÆ')
+# Deletion tables: word.translate(table) is empty iff all its letters are allowed
+_DROP_VALID = str.maketrans('', '', ''.join(FI_CHARS | NO_CHARS))
+
+def _word_pattern(letters: FrozenSet[str], vowels: str):
+    """Compile a regex that fully matches the acceptable words of a language.
+
+    A word must consist of the given letters, contain at least one vowel and
+    have at most three consonants in a row, since longer runs are rare in
+    both languages (likely gibberish).
+    """
+    consonants = ''.join(sorted(letters - set(vowels)))
+    return re.compile(f'(?=.*[{vowels}])(?!.*[{consonants}]{{4}})[{"".join(sorted(letters))}]+')
+
+# Per-language word rules for filter_words
+_LANGUAGE_WORD = {
+    'fi': _word_pattern(FI_CHARS, 'AEIOUYÄÖ'),
+    'no': _word_pattern(NO_CHARS, 'AEIOUYÅØÆ'),
+}
+
+@functools.lru_cache(maxsize=None)
+def _normalize(raw: str) -> str:
+    """Uppercase a word list entry, dropping any 'prefix:' and surrounding space."""
+    return raw.split(':')[-1].strip().upper()
+
+# Version of the pickled hints cache; bump it whenever load_word_hints
+# changes what it stores (2: keys lowercased)
+_HINTS_CACHE_FORMAT = 2
+
+def load_word_hints(json_path: str) -> Dict[str, str]:
+    """Load a word -> hint mapping from a JSON file.
+
+    A pickled copy is kept next to the JSON file and used while it is not
+    older than the JSON and was written in the current _HINTS_CACHE_FORMAT,
+    since unpickling is much faster than json.load.
+    """
+    pickle_path = os.path.splitext(json_path)[0] + '.pkl'
+    try:
+        if os.path.getmtime(pickle_path) >= os.path.getmtime(json_path):
+            with open(pickle_path, 'rb') as f:
+                cached = pickle.load(f)
+            # Caches from older versions hold a bare dict, possibly with mixed-case keys
+            if isinstance(cached, tuple) and len(cached) == 2 and cached[0] == _HINTS_CACHE_FORMAT:
+                return cached[1]
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass  # Missing or unreadable cache, fall back to the JSON file
+
+    with open(json_path, 'r', encoding='utf-8') as f:
+        # Keys are matched against word.lower(), so normalize them once here
+        word_hints = {word.lower(): hint for word, hint in json.load(f).items()}
+    # Write a private temporary file and swap it in, so a crash or another
+    # process loading the hints never sees a half-written cache
+    tmp_path = f'{pickle_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((_HINTS_CACHE_FORMAT, word_hints), f, protocol=5)
+        os.replace(tmp_path, pickle_path)
+    except OSError:
+        # Read-only location, keep using the JSON file
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return word_hints
+
+def _can_place_h(grid: bytearray, rows: List[int], W: int, H: int, wb: bytes,
+                 row: int, col: int, need_contact: bool) -> int:
+    """_can_place for an across word inside the grid; rows are the per-row occupancy bits."""
+    bits = rows[row]
+    span = ((1 << len(wb)) - 1) << col
+    # Cells right before and after the word must be empty; off-grid ends
+    # shift out (col - 1) or land on bit W, which is never set
+    if bits & (span << 1 | span >> 1) & ~span:
+        return -1
+    crossed = bits & span
+    if need_contact and not crossed:
+        return -1
+    # New letters may not sit next to a letter of a parallel word: one AND
+    # against each neighbouring row covers the whole word
+    new = span ^ crossed
+    if (row > 0 and rows[row - 1] & new) or (row + 1 < H and rows[row + 1] & new):
+        return -1
+
+    # Only the crossed cells need their letters compared
+    intersections = 0
+    base = row * W
+    while crossed:
+        low = crossed & -crossed
+        c = low.bit_length() - 1
+        if grid[base + c] != wb[c - col]:
+            return -1
+        intersections += 1
+        crossed ^= low
+    return intersections
+
+def _can_place_v(grid: bytearray, cols: List[int], W: int, H: int, wb: bytes,
+                 row: int, col: int, need_contact: bool) -> int:
+    """_can_place for a down word inside the grid; cols are the per-column occupancy bits."""
+    bits = cols[col]
+    span = ((1 << len(wb)) - 1) << row
+    # Cells right above and below the word must be empty
+    if bits & (span << 1 | span >> 1) & ~span:
+        return -1
+    crossed = bits & span
+    if need_contact and not crossed:
+        return -1
+    new = span ^ crossed
+    if (col > 0 and cols[col - 1] & new) or (col + 1 < W and cols[col + 1] & new):
+        return -1
+
+    intersections = 0
+    while crossed:
+        low = crossed & -crossed
+        r = low.bit_length() - 1
+        if grid[r * W + col] != wb[r - row]:
+            return -1
+        intersections += 1
+        crossed ^= low
+    return intersections
+
+def _can_place(grid: bytearray, rows: List[int], cols: List[int], W: int, H: int,
+               wb: bytes, row: int, col: int, horizontal: bool, need_contact: bool) -> int:
+    """Check a placement on the flat grid and count its intersections.
+
+    rows and cols hold one occupancy bit per cell, bit c of rows[r] and
+    bit r of cols[c] for cell (r, c). Returns the number of letters that
+    cross existing letters, or -1 if the word does not fit, clashes, or
+    touches a word beside it. With need_contact the word must also cross
+    at least one placed word.
+    """
+    # The word must fit within the grid; the kernels below rely on it
+    if row < 0 or col < 0:
+        return -1
+    if horizontal:
+        if row >= H or col + len(wb) > W:
+            return -1
+        return _can_place_h(grid, rows, W, H, wb, row, col, need_contact)
+    if col >= W or row + len(wb) > H:
+        return -1
+    return _can_place_v(grid, cols, W, H, wb, row, col, need_contact)
+
+def _fills_isolated_area(lines: List[int], size: int, line: int, pos: int, length: int) -> bool:
+    """Check if a placement fills a gap mostly surrounded by letters.
+
+    lines are the occupancy bits of the lines running along the word
+    (rows for an across word, columns for a down word) and size their
+    length. Counts the filled and empty neighbours of the cells the word
+    would fill, over all of them at once: shifting the new cells by one
+    and ANDing with a neighbouring line counts every diagonal pair. The
+    placement must lie inside the grid.
+    """
+    # Cells already holding a letter (intersections) are skipped
+    new = (((1 << length) - 1) << pos) & ~lines[line]
+    if not new:
+        return False
+    filled_neighbors = 0
+    n_lines = 0
+    for bits in lines[max(line - 1, 0):line + 2]:
+        filled_neighbors += (bits & new).bit_count() + (bits & new << 1).bit_count() + (bits & new >> 1).bit_count()
+        n_lines += 1
+    # Neighbours inside the grid: a 3x3 window clipped at the edges, minus the cell
+    cells = new.bit_count()
+    columns = 3 * cells - (new & 1) - (new >> (size - 1) & 1)
+    empty_neighbors = n_lines * columns - cells - filled_neighbors
+    return empty_neighbors <= length * 3 and filled_neighbors >= length * 2
+
+def build_letter_index(word_bytes) -> Dict[int, List[Tuple[int, int, Tuple[int, ...]]]]:
+    """Map each letter byte to (offset, length, word_indices) groups.
+
+    word_indices are the words of that length with the letter at that
+    offset, so every word in a group anchored on cell c starts at
+    c - offset and the whole group is kept or dropped by one test. Groups
+    are ordered by offset.
+    """
+    groups = defaultdict(list)
+    for word_index, wb in enumerate(word_bytes):
+        length = len(wb)
+        for offset, letter in enumerate(wb):
+            groups[(letter, offset, length)].append(word_index)
+    by_letter = defaultdict(list)
+    for (letter, offset, length), word_indices in sorted(groups.items()):
+        by_letter[letter].append((offset, length, tuple(word_indices)))
+    return dict(by_letter)
+
+def _line_placements(grid: bytearray, lines: List[int], W: int, H: int, line: int, down: int,
+                     size: int, candidates, by_letter, need_contact: bool):
+    """Every placement along one row (down=0) or column (down=1) that crosses it.
+
+    lines are the occupancy bits of the rows or columns. Each letter in the
+    line anchors the candidate words sharing it, as long as the word stays
+    inside the grid and its start is open (see below). Returns
+    (word_index, row, col, down, length, score) for the placements that
+    fit, where score leaves out the bonuses that depend on how many words
+    are placed.
+
+    Most anchored placements end against a letter or run beside a parallel
+    word. Both can be read off the line bits for all starts of a word length
+    at once, so those are dropped before the full check.
+    """
+    line_size = H if down else W
+    check = _can_place_v if down else _can_place_h
+    bits = lines[line]
+    # Empty cells of the line with a letter beside them: a new letter there
+    # would touch a parallel word
+    beside = (lines[line - 1] if line > 0 else 0) | (lines[line + 1] if line + 1 < len(lines) else 0)
+    beside &= ~bits
+    open_starts = {}  # length -> bit s set if a word of that length may start at s
+
+    starts = set()
+    rest = bits
+    while rest:
+        low = rest & -rest
+        pos = low.bit_length() - 1
+        rest ^= low
+        cell = grid[pos * W + line] if down else grid[line * W + pos]
+        for offset, length, word_indices in by_letter.get(cell, ()):
+            if offset > pos:
+                break  # Groups come by offset; the rest would start off the grid
+            start = pos - offset
+            if start + length > line_size:
+                continue
+            mask = open_starts.get(length)
+            if mask is None:
+                # Bit s of spread is set if cells s..s+length-1 include a
+                # blocked one; the end cells s-1 and s+length must be empty
+                spread = beside
+                for k in range(1, length):
+                    spread |= beside >> k
+                mask = open_starts[length] = ~(bits << 1 | bits >> length | spread)
+            if mask >> start & 1:
+                starts.update(zip(word_indices, repeat(start)))
+
+    placements = []
+    lo, hi = size * 0.2, size * 0.8
+    for word_index, start in starts:
+        row, col = (start, line) if down else (line, start)
+        wb = candidates[word_index][1]
+        length = len(wb)
+        intersections = check(grid, lines, W, H, wb, row, col, need_contact)
+        if intersections < 0:
+            continue
+        score = intersections * 10
+        # Prefer positions in the middle 60% of the grid
+        if lo <= row <= hi and lo <= col <= hi:
+            score += 5
+        # Extra points for crossing more than one word
+        if intersections > 1:
+            score += 10
+        # Bonus for words that fill isolated areas
+        if _fills_isolated_area(lines, line_size, line, start, length):
+            score += 20
+        placements.append((word_index, row, col, down, length, score))
+    return placements
+
+def _best_placement(grid: bytearray, rows: List[int], cols: List[int], W: int, H: int,
+                    size: int, candidates, by_letter, skip, n_placed: int,
+                    banned=(), cache=None, versions=None, good_enough=None):
+    """Score the placements that cross the grid and return the best one.
+
+    candidates is a list of (word, word_bytes) and by_letter its
+    build_letter_index(). Word indices in skip and (word_index, row, col,
+    down) placements in banned are ignored. Only positions that put a
+    letter of a word on a matching letter of the grid are tried, since
+    every other position fails the must-intersect rule. Returns (score,
+    word, row, col, horizontal), or None if nothing fits. Ties go to the
+    first placement in word, row, column, horizontal-first order.
+
+    Whether a placement fits, and most of its score, only depend on its own
+    row or column and the two next to it. versions are the generator's
+    (row, col) change counters, padded with one line at each end, and cache
+    keeps the _line_placements() of each line between calls: a line is only
+    checked again once the counters of it or a neighbour have moved.
+
+    With good_enough, lines are scored in order (rows, then columns) and
+    the best placement so far is returned as soon as a finished line
+    brings it to at least good_enough, so the remaining lines are neither
+    checked nor fetched from the cache.
+    """
+    if cache is None:
+        cache = {}
+    if versions is None:
+        versions = ([0] * (H + 2), [0] * (W + 2))
+    need_contact = n_placed > 0
+    best = None
+    best_key = None
+    for down, lines, line_version in ((0, rows, versions[0]), (1, cols, versions[1])):
+        for line in range(len(lines)):
+            # Counters only grow, so the sum changes whenever one of the lines does
+            band = line_version[line] + line_version[line + 1] + line_version[line + 2]
+            known = cache.get((down, line))
+            if known is None or known[0] != band:
+                known = cache[(down, line)] = (band, _line_placements(
+                    grid, lines, W, H, line, down, size, candidates, by_letter, need_contact))
+
+            for word_index, row, col, _, length, score in known[1]:
+                if word_index in skip or (word_index, row, col, down) in banned:
+                    continue
+                # Bonus for filling gaps (more points for shorter words)
+                if n_placed >= 10 and length <= 4:
+                    score += 25 - length * 4
+                # Extra bonus for 3-letter words after initial structure is built
+                if n_placed >= 15 and length == 3:
+                    score += 15
+                key = (-score, word_index, row, col, down)
+                if best_key is None or key < best_key:
+                    best_key = key
+                    best = (score, candidates[word_index][0], row, col, not down)
+            if good_enough is not None and best is not None and best[0] >= good_enough:
+                return best
+    return best
 
 class CrosswordGenerator:
+    # Phase 1 takes the best placement of the grid lines scored so far once
+    # it reaches this score (35: two crossings near the centre) instead of
+    # scoring every line. None scores every line on each step
+    good_enough_score: Optional[int] = 35
+
     def __init__(
         self,
         size=None,  # Can be an integer for square grids or None if width/height are provided
@@ -14,7 +347,8 @@ class CrosswordGenerator:
         language: str = "fi",
         words_file: Optional[str] = None,
         theme: Optional[str] = None,
-        difficulty: str = "medium"
+        difficulty: str = "medium",
+        seed: Optional[int] = None
     ):
         # Handle different ways of specifying grid dimensions
         if size is not None:
@@ -33,15 +367,55 @@ class CrosswordGenerator:
         self.words_file = words_file
         self.theme = theme
         self.difficulty = difficulty
-        self.words: Set[str] = set()
-        # Create a grid with the specified dimensions
-        self.grid = [[' ' for _ in range(self.width)] for _ in range(self.height)]
+        # Private random generator so a seed gives a reproducible puzzle
+        self.seed = seed
+        self.random = random.Random(seed)
+        # Read-only word set; callers may share one frozenset between generators
+        self.words: FrozenSet[str] = frozenset()
+        # Flat grid of latin-1 bytes, row-major: cell (r, c) is _grid[r * width + c]
+        self._grid = bytearray(b' ' * (self.width * self.height))
+        # Occupancy bits mirroring _grid: bit c of _row_bits[r] and bit r of
+        # _col_bits[c] are set when cell (r, c) holds a letter
+        self._row_bits = [0] * self.height
+        self._col_bits = [0] * self.width
+        # Change counters per row and column, bumped whenever a cell of the
+        # line is filled or cleared. Padded with one unused line at each end:
+        # line i is entry i + 1, so the versions of a line and its two
+        # neighbours are always _row_version[i:i + 3]
+        self._row_version = [0] * (self.height + 2)
+        self._col_version = [0] * (self.width + 2)
+        self._word_bytes: Dict[str, bytes] = {}
         self.placed_words = []  # List of (word, row, col, horizontal, hint)
+        self.placed_word_set: Set[str] = set()  # Words in placed_words, for O(1) lookups
+        self.occupied_cells: List[Tuple[int, int, int]] = []  # (row, col, letter byte) in fill order
+        # Undo record per placed word: (cells it filled, (start, previous marker))
+        self._history = []
         # Initialize word hints dictionary (will be populated by app.py)
         self.word_hints = {}  
+        # Lazily built by _hint_ranks() for the word_hints dict it was built from,
+        # together with the resolved hint of each word placed so far
+        self._hint_rank: Dict[str, int] = {}
+        self._hint_cache: Dict[str, str] = {}
+        self._hint_rank_source = None
+        # Words of the filter_words() result bucketed by length, each once, in list order
+        self.words_by_len: Dict[int, List[str]] = {}
         self.word_numbers = {}
         self.current_number = 1        
     @property
+    def grid(self) -> List[List[str]]:
+        """The grid as rows of single-character strings."""
+        text = self._grid.decode('latin-1')
+        W = self.width
+        return [list(text[r * W:(r + 1) * W]) for r in range(self.height)]
+
+    def _encode(self, word: str) -> bytes:
+        """Return the latin-1 bytes of a word, encoding each word only once."""
+        wb = self._word_bytes.get(word)
+        if wb is None:
+            wb = self._word_bytes[word] = word.encode('latin-1', 'replace')
+        return wb
+
+    @property
     def size(self):
         # This property ensures backward compatibility with code that still uses self.size
         return self._size
@@ -57,30 +431,36 @@ class CrosswordGenerator:
         hints_file = os.path.join(os.path.dirname(__file__), 'word_hints.json')
         if os.path.exists(hints_file):
             try:
-                with open(hints_file, 'r', encoding='utf-8') as f:
-                    self.word_hints = json.load(f)
-                print(f"Loaded {len(self.word_hints)} word hints from {hints_file}")
-                # Print a few examples for debugging
-                examples = list(self.word_hints.items())[:5]
-                print(f"Example hints: {examples}")
+                self.word_hints = load_word_hints(hints_file)
+                logger.debug("Loaded %d word hints from %s", len(self.word_hints), hints_file)
+                # Log a few examples for debugging; only build the list if it is shown
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Example hints: %s", list(self.word_hints.items())[:5])
             except Exception as e:
-                print(f"Error loading word hints: {e}")
+                logger.warning("Error loading word hints: %s", e)
                 self.word_hints = {}
         else:
-            print(f"Word hints file not found: {hints_file}")
+            logger.warning("Word hints file not found: %s", hints_file)
             self.word_hints = {}
 
     def load_words(self) -> None:
         """Load words from file or use default word list."""
         if self.words_file:
-            with open(self.words_file, 'r', encoding='utf-8') as f:
-                self.words = {line.strip().upper() for line in f if line.strip()}
+            # One read and one uppercase pass over the whole file
+            with open(self.words_file, 'rb') as f:
+                text = f.read().decode('utf-8').upper()
+            lines = text.splitlines()
+            if ':' in text:
+                words = frozenset(map(_normalize, lines))
+            else:
+                words = frozenset(map(str.strip, lines))
+            self.words = words - {''}
         else:
             # Default sample words
-            self.words = {
+            self.words = frozenset({
                 'JÄRVI', 'SAARI', 'KALA', 'TALO', 'KIRJA',
                 'FJORD', 'SKOG', 'BÅT', 'HUS', 'BOK'
-            }
+            })
 
     def is_valid_word(self, word: str) -> bool:
         """Check if word is valid for the chosen language(s)."""
@@ -88,82 +468,25 @@ class CrosswordGenerator:
             return False
             
         # Basic character validation for Finnish/Norwegian
-        valid_chars = set('ABCDEFGHIJKLMNOPQRSTUVWXYZÅØÆÄÖ')
-        return all(c in valid_chars for c in word)
+        return not word.translate(_DROP_VALID)
 
     def filter_words(self) -> List[str]:
         """Filter words based on language and validity."""
-        valid_words = []
-        print(f"Total words: {len(self.words)}")
-        for word in self.words:
-            # Skip empty words or non-string items
-            if not isinstance(word, str) or not word.strip():
-                continue
+        logger.debug("Total words: %d", len(self.words))
+        # Pass 1: uppercase and drop any prefix (cached across calls and
+        # generators), keeping only words between 3 and 15 letters. self.words
+        # is usually a frozenset, whose order changes with the hash seed of
+        # the process, so the words are sorted to make a seed reproduce a puzzle
+        valid_words = sorted({word for word in map(_normalize, self.words) if 3 <= len(word) <= 15})
+        # Pass 2: letters of the language only, with a vowel and no long consonant
+        # run; 'both' or any other language keeps every word
+        pattern = _LANGUAGE_WORD.get(self.language)
+        if pattern is not None:
+            valid_words = list(filter(pattern.fullmatch, valid_words))
 
-            # Convert word to uppercase and remove any trailing numbers
-            word = word.split(':')[-1].strip().upper()
-            
-            # Only use words between 3 and 15 letters
-            if 3 <= len(word) <= 15:
-                # For Finnish, ensure word only contains valid Finnish characters
-                if self.language == 'fi':
-                    # Allow Ä, Ö, and basic Latin letters
-                    valid_chars = set('ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖ')
-                    if all(c in valid_chars for c in word):
-                        # Additional quality checks for Finnish words
-                        # Avoid words with too many consecutive consonants (likely gibberish)
-                        consonants = 'BCDFGHJKLMNPQRSTVWXZ'
-                        vowels = 'AEIOUYÄÖ'
-                        
-                        # Check for reasonable vowel-consonant patterns
-                        max_consecutive_consonants = 0
-                        current_consecutive = 0
-                        
-                        for char in word:
-                            if char in consonants:
-                                current_consecutive += 1
-                                max_consecutive_consonants = max(max_consecutive_consonants, current_consecutive)
-                            else:
-                                current_consecutive = 0
-                                
-                        # Finnish rarely has more than 3 consecutive consonants
-                        # Also ensure the word has at least one vowel
-                        has_vowel = any(c in vowels for c in word)
-                        
-                        if max_consecutive_consonants <= 3 and has_vowel:
-                            valid_words.append(word)
-                elif self.language == 'no':
-                    # Allow Å, Ø, Æ, and basic Latin letters
-                    valid_chars = set('ABCDEFGHIJKLMNOPQRSTUVWXYZÅØÆ')
-                    if all(c in valid_chars for c in word):
-                        # Additional quality checks for Norwegian words
-                        # Avoid words with too many consecutive consonants (likely gibberish)
-                        consonants = 'BCDFGHJKLMNPQRSTVWXZ'
-                        vowels = 'AEIOUYÅØÆ'
-                        
-                        # Check for reasonable vowel-consonant patterns
-                        max_consecutive_consonants = 0
-                        current_consecutive = 0
-                        
-                        for char in word:
-                            if char in consonants:
-                                current_consecutive += 1
-                                max_consecutive_consonants = max(max_consecutive_consonants, current_consecutive)
-                            else:
-                                current_consecutive = 0
-                                
-                        # Norwegian rarely has more than 3 consecutive consonants
-                        # Also ensure the word has at least one vowel
-                        has_vowel = any(c in vowels for c in word)
-                        
-                        if max_consecutive_consonants <= 3 and has_vowel:
-                            valid_words.append(word)
-                else:  # 'both' or any other language
-                    valid_words.append(word)
-        
-        print(f"Valid words after filtering: {len(valid_words)}")
+        logger.debug("Valid words after filtering: %d", len(valid_words))
         if not valid_words:
-            print("No valid words found after filtering!")
+            logger.warning("No valid words found after filtering!")
         
         # Sort words by length, with a mix of long and short words
         def word_priority(word):
@@ -179,290 +502,386 @@ class CrosswordGenerator:
             else:
                 return (2, -length)  # Long words last
         
-        valid_words.sort(key=word_priority)
-        # Increase word limit for denser puzzles
-        valid_words = valid_words[:500]  # Increased from 300 to 500 for even more word options
+        # Increase word limit for denser puzzles; only the 500 best are needed,
+        # so select them with a bounded heap instead of sorting every word
+        valid_words = heapq.nsmallest(500, valid_words, key=word_priority)
         # Shuffle medium and long words, but keep short words separate for gap filling
         medium_long_words = [w for w in valid_words if len(w) >= 5]
         short_words = [w for w in valid_words if len(w) < 5]
         very_short_words = [w for w in valid_words if len(w) == 3]  # Special category for 3-letter words
-        random.shuffle(medium_long_words)
-        random.shuffle(short_words)
-        random.shuffle(very_short_words)
+        self.random.shuffle(medium_long_words)
+        self.random.shuffle(short_words)
+        self.random.shuffle(very_short_words)
+        # Bucket the words by length once, keeping their order within each
+        # bucket; the repeats added below only weight the returned list
+        self.words_by_len = {}
+        for word in dict.fromkeys(medium_long_words + short_words):
+            self.words_by_len.setdefault(len(word), []).append(word)
         # Increase proportion of short words to help fill gaps
         valid_words = medium_long_words + short_words * 2 + very_short_words * 3  # Triple very short words for maximum filling
         return valid_words
 
     def can_place_word(self, word: str, row: int, col: int, horizontal: bool) -> bool:
         """Check if a word can be placed at the given position with proper crossword rules."""
-        # First, validate the input coordinates are within the grid
-        if row < 0 or row >= self.height or col < 0 or col >= self.width:
-            return False
-            
-        # Check if word fits within the grid
-        if horizontal and col + len(word) > self.width:
-            return False
-        if not horizontal and row + len(word) > self.height:
-            return False
-
-        # Check if placement creates invalid words
-        intersects = False
-        has_adjacent = False
-        
-        # Check the space before the word (if not at the edge)
-        if horizontal and col > 0:
-            if self.grid[row][col-1] != ' ':
-                return False  # Can't have a letter immediately before the word
-        if not horizontal and row > 0:
-            if self.grid[row-1][col] != ' ':
-                return False  # Can't have a letter immediately above the word
-        
-        # Check the space after the word (if not at the edge)
-        if horizontal and col + len(word) < self.width:
-            if self.grid[row][col + len(word)] != ' ':
-                return False  # Can't have a letter immediately after the word
-        if not horizontal and row + len(word) < self.height:
-            if self.grid[row + len(word)][col] != ' ':
-                return False  # Can't have a letter immediately below the word
-        
-        # Check each position of the word
-        for i in range(len(word)):
-            current_row = row if horizontal else row + i
-            current_col = col + i if horizontal else col
-            
-            # Ensure we're within grid bounds
-            if current_row >= self.height or current_col >= self.width:
-                return False
-
-            # Check the cell itself - must be empty or match the letter
-            if self.grid[current_row][current_col] not in [' ', word[i]]:
-                return False
-            
-            # If this cell has a letter, it's an intersection
-            if self.grid[current_row][current_col] == word[i]:
-                intersects = True
-            
-            # Check for adjacent letters (which should only be at intersections)
-            if horizontal:
-                # Check above and below (with careful boundary checking)
-                if current_row > 0 and current_row-1 < self.height and current_col < self.width and self.grid[current_row-1][current_col] != ' ':
-                    # If we're not at an intersection, this is invalid
-                    if self.grid[current_row][current_col] != word[i]:
-                        return False
-                    has_adjacent = True
-                    
-                if current_row+1 < self.height and current_col < self.width and self.grid[current_row+1][current_col] != ' ':
-                    # If we're not at an intersection, this is invalid
-                    if self.grid[current_row][current_col] != word[i]:
-                        return False
-                    has_adjacent = True
-            else:
-                # Check left and right
-                if current_col > 0 and current_row < self.height and current_col-1 < self.width and self.grid[current_row][current_col-1] != ' ':
-                    # If we're not at an intersection, this is invalid
-                    if self.grid[current_row][current_col] != word[i]:
-                        return False
-                    has_adjacent = True
-                    
-                if current_col+1 < self.width and current_row < self.height and self.grid[current_row][current_col+1] != ' ':
-                    # If we're not at an intersection, this is invalid
-                    if self.grid[current_row][current_col] != word[i]:
-                        return False
-                    has_adjacent = True
-
         # Word must intersect with existing words (except first word)
-        if self.placed_words:
-            if not intersects and not has_adjacent:
-                return False
-
-        return True
+        return _can_place(self._grid, self._row_bits, self._col_bits, self.width, self.height,
+                          self._encode(word), row, col, horizontal, bool(self.placed_words)) >= 0
 
     def place_word(self, word: str, row: int, col: int, horizontal: bool) -> None:
         """Place a word on the grid."""
+        W = self.width
+        grid = self._grid
+        marker = None
         # We'll assign numbers in reading order later
         # Just record if this position is a start of a word
         if horizontal:
-            if col == 0 or self.grid[row][col-1] == ' ':
+            if col <= 0 or grid[row * W + col - 1] == EMPTY:
+                previous = self.word_numbers.get((row, col))
+                marker = ((row, col), dict(previous) if previous else None)
                 # Mark as a starting position for a horizontal word
                 if (row, col) not in self.word_numbers:
                     self.word_numbers[(row, col)] = {'across': True}
                 else:
                     self.word_numbers[(row, col)]['across'] = True
         else:
-            if row == 0 or self.grid[row-1][col] == ' ':
+            if row <= 0 or grid[(row - 1) * W + col] == EMPTY:
+                previous = self.word_numbers.get((row, col))
+                marker = ((row, col), dict(previous) if previous else None)
                 # Mark as a starting position for a vertical word
                 if (row, col) not in self.word_numbers:
                     self.word_numbers[(row, col)] = {'down': True}
                 else:
                     self.word_numbers[(row, col)]['down'] = True
             
-        # Place the word on the grid
-        for i in range(len(word)):
-            # Make sure we're within grid boundaries
-            if horizontal and 0 <= row < self.size and 0 <= col+i < self.size:
-                self.grid[row][col+i] = word[i]
-            elif not horizontal and 0 <= row+i < self.size and 0 <= col < self.size:
-                self.grid[row+i][col] = word[i]
-            else:
-                # If we're out of bounds, don't place this part of the word
-                # This should be prevented by can_place_word, but adding as a safeguard
-                continue
-                
+        # Place the word on the grid with one slice assignment; down words
+        # step through the flat grid one row (W bytes) at a time
+        wb = self._encode(word)
+        H = self.height
+        if horizontal:
+            pos, step, room = col, 1, W - col
+            bits = self._row_bits[row] if 0 <= row < H else None
+        else:
+            pos, step, room = row, W, H - row
+            bits = self._col_bits[col] if 0 <= col < W else None
+        # Clip to the grid; can_place_word prevents this, it is only a safeguard
+        first, last = max(-pos, 0), min(len(wb), room)
+        filled = []
+        if bits is not None and first < last:
+            # Cells the word fills: its span minus the cells already occupied
+            new = (((1 << (last - first)) - 1) << (pos + first)) & ~bits
+            while new:
+                low = new & -new
+                i = low.bit_length() - 1 - pos
+                r, c = (row, col + i) if horizontal else (row + i, col)
+                filled.append(r * W + c)
+                self.occupied_cells.append((r, c, wb[i]))
+                self._row_bits[r] |= 1 << c
+                self._col_bits[c] |= 1 << r
+                self._row_version[r + 1] += 1
+                self._col_version[c + 1] += 1
+                new ^= low
+            start = row * W + col
+            grid[start + first * step:start + last * step:step] = wb[first:last]
+
         # Get hint for the word or use a default hint
+        hint = self._hint_for(word)
+
+        # Add to placed words list with hint
+        self.placed_words.append((word, row, col, horizontal, hint))
+        self.placed_word_set.add(word)
+        self._history.append((filled, marker))
+
+    def _hint_for(self, word: str) -> str:
+        """Hint for a placed word, resolved once per word and then cached."""
+        ranks = self._hint_ranks()
+        hint = self._hint_cache.get(word)
+        if hint is not None:
+            return hint
         word_lower = word.lower()
-        
+
         # Check if the word is in our hint dictionary
         if word_lower in self.word_hints:
             hint = self.word_hints[word_lower]
-            print(f"Found hint for '{word_lower}': {hint}")
+            logger.debug("Found hint for '%s': %s", word_lower, hint)
         else:
-            # Try to find a partial match (e.g., if the word is a compound or inflected form)
-            found_partial = False
-            for hint_word, hint_text in self.word_hints.items():
-                # If the word contains a known word from our hints dictionary
-                if hint_word in word_lower and len(hint_word) >= 3:
-                    hint = f"{hint_text} (related to '{hint_word}')".capitalize()
-                    found_partial = True
-                    print(f"Found partial hint for '{word_lower}' via '{hint_word}': {hint}")
-                    break
-            
-            # If no match found, use a generic hint
-            if not found_partial:
+            # Try to find a partial match (e.g., if the word is a compound or inflected form):
+            # the first hint word, in word_hints order, that the word contains.
+            # Each 3+ letter piece of the word is looked up, instead of testing
+            # every hint word against it
+            n = len(word_lower)
+            pieces = {word_lower[i:j] for i in range(n - 2) for j in range(i + 3, n + 1)}
+            match = min(((ranks[piece], piece) for piece in pieces if piece in ranks), default=None)
+            if match is not None:
+                hint_word = match[1]
+                hint = f"{self.word_hints[hint_word]} (related to '{hint_word}')".capitalize()
+                logger.debug("Found partial hint for '%s' via '%s': %s", word_lower, hint_word, hint)
+            else:
+                # If no match found, use a generic hint
                 hint = f"Definition for {word}"
-                print(f"No hint found for '{word_lower}', using default")
-                
-        # Add to placed words list with hint
-        self.placed_words.append((word, row, col, horizontal, hint))
+                logger.debug("No hint found for '%s', using default", word_lower)
+        self._hint_cache[word] = hint
+        return hint
+
+    def _hint_ranks(self) -> Dict[str, int]:
+        """Position of each hint word of 3+ letters in word_hints.
+
+        Rebuilt, and the resolved hints dropped, when word_hints is replaced
+        (app.py assigns its own dict).
+        """
+        if self._hint_rank_source is not self.word_hints:
+            self._hint_rank_source = self.word_hints
+            self._hint_rank = {hint_word: i for i, hint_word in enumerate(self.word_hints)
+                               if len(hint_word) >= 3}
+            self._hint_cache = {}
+        return self._hint_rank
+
+    def _sync_bits(self) -> None:
+        """Rebuild the occupancy bits after _grid was replaced wholesale."""
+        W = self.width
+        self._row_bits = [0] * self.height
+        self._col_bits = [0] * W
+        # Every line may have changed
+        self._row_version = [v + 1 for v in self._row_version]
+        self._col_version = [v + 1 for v in self._col_version]
+        for idx, cell in enumerate(self._grid):
+            if cell != EMPTY:
+                r, c = divmod(idx, W)
+                self._row_bits[r] |= 1 << c
+                self._col_bits[c] |= 1 << r
+
+    def remove_last_word(self) -> None:
+        """Undo the most recent place_word call."""
+        word = self.placed_words.pop()[0]
+        if not any(placed[0] == word for placed in self.placed_words):
+            self.placed_word_set.discard(word)
+        filled, marker = self._history.pop()
+        for idx in filled:
+            self._grid[idx] = EMPTY
+            r, c = divmod(idx, self.width)
+            self._row_bits[r] &= ~(1 << c)
+            self._col_bits[c] &= ~(1 << r)
+            self._row_version[r + 1] += 1
+            self._col_version[c + 1] += 1
+        # This word's cells were the last ones filled
+        if filled:
+            del self.occupied_cells[-len(filled):]
+        if marker is not None:
+            start, previous = marker
+            if previous is None:
+                del self.word_numbers[start]
+            else:
+                self.word_numbers[start] = previous
+
+    def _search(self, candidates, by_letter, max_words: int, max_attempts: int,
+                max_backtracks: int = 10) -> None:
+        """Place crossing words greedily, backing up when the search runs dry.
+
+        Each step places the best scoring placement from _best_placement.
+        When no candidate fits any more (a dead end), the grid is saved if it
+        is the fullest so far, the last placements are undone and the
+        placement the search backs up to is banned, so the next step has to
+        pick something else. Repeated dead ends jump back further. At the
+        end the fullest grid seen is kept.
+        """
+        W, H = self.width, self.height
+        grid = self._grid
+        word_index = {word: i for i, (word, _) in enumerate(candidates)}
+        banned = set()  # (word_index, row, col, down) placements that led to dead ends
+        checked = {}  # Placements per grid line, reused across steps by _best_placement
+        best = None
+        backtracks = 0
+        jump = 1
+        attempts = 0
+
+        while attempts < max_attempts and len(self.placed_words) < max_words:
+            skip = {word_index[w] for w in self.placed_word_set if w in word_index}
+            found = _best_placement(grid, self._row_bits, self._col_bits, W, H, self.size,
+                                    candidates, by_letter, skip, len(self.placed_words), banned,
+                                    checked, (self._row_version, self._col_version),
+                                    self.good_enough_score)
+            attempts += 1
+            if found:
+                _, word, row, col, horizontal = found
+                self.place_word(word, row, col, horizontal)
+                continue
+
+            # Dead end: keep the fullest grid and back up
+            if best is None or len(self.placed_words) > len(best[0]):
+                best = (list(self.placed_words), bytes(grid),
+                        {key: dict(value) for key, value in self.word_numbers.items()},
+                        list(self._history), list(self.occupied_cells))
+                jump = 1
+            else:
+                jump *= 2  # Same region failed again, jump further back
+            # The first word stays; it anchors the whole grid
+            steps = min(jump, len(self.placed_words) - 1)
+            if backtracks >= max_backtracks or steps <= 0:
+                break
+            backtracks += 1
+            for _ in range(steps):
+                word, row, col, horizontal, _ = self.placed_words[-1]
+                self.remove_last_word()
+            if word in word_index:
+                banned.add((word_index[word], row, col, 0 if horizontal else 1))
+
+        if best is not None and len(best[0]) > len(self.placed_words):
+            self.placed_words, saved_grid, self.word_numbers, self._history, self.occupied_cells = best
+            self.placed_word_set = {placed[0] for placed in self.placed_words}
+            grid[:] = saved_grid
+            self._sync_bits()
+
+    def _crossing_positions(self, word: str) -> List[Tuple[int, int, bool]]:
+        """Positions where word would cross a placed letter.
+
+        Returned as (row, col, horizontal) in row, column, across-first
+        order, the order of a full grid scan. Once a word is on the grid
+        these are the only positions can_place_word() accepts; positions
+        running off the grid are left out.
+        """
+        wb = self._encode(word)
+        offsets = {}
+        for offset, letter in enumerate(wb):
+            offsets.setdefault(letter, []).append(offset)
+        # A word anchored at offset on cell c ends at c + length - offset
+        W, H, length = self.width, self.height, len(wb)
+        positions = set()
+        for r, c, letter in self.occupied_cells:
+            for offset in offsets.get(letter, ()):
+                if offset <= c and c + length - offset <= W:
+                    positions.add((r, c - offset, 0))  # across
+                if offset <= r and r + length - offset <= H:
+                    positions.add((r - offset, c, 1))  # down
+        return [(row, col, not down) for row, col, down in sorted(positions)]
 
-    def _has_adjacent_words(self, row, col, horizontal, length):
-        """Check if a word placement has adjacent or intersecting words."""
-        # Check for intersections
-        for i in range(length):
-            r, c = (row, col + i) if horizontal else (row + i, col)
-            if 0 <= r < self.size and 0 <= c < self.size and self.grid[r][c] != ' ':
-                return True
-                
-        # Check for adjacent words
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # up, down, left, right
-        for i in range(length):
-            r, c = (row, col + i) if horizontal else (row + i, col)
-            if 0 <= r < self.height and 0 <= c < self.width:
-                for dr, dc in directions:
-                    nr, nc = r + dr, c + dc
-                    if 0 <= nr < self.height and 0 <= nc < self.width and self.grid[nr][nc] != ' ':
-                        return True
-                        
-        return False
-        
     def assign_numbers_in_reading_order(self):
         """Assign numbers to the grid in reading order (top-to-bottom, left-to-right)."""
         # Create a new dictionary to store the final numbered positions
         numbered_positions = {}
         current_number = 1
         
-        # Scan the grid from top to bottom, left to right
-        for row in range(self.height):
-            for col in range(self.width):
-                # Skip empty cells
-                if self.grid[row][col] == ' ':
-                    continue
-                    
-                # Check if this position is a start of a word (already marked in self.word_numbers)
-                if (row, col) in self.word_numbers:
-                    # This is a starting position for at least one word
-                    numbered_positions[(row, col)] = current_number
-                    current_number += 1
+        # Visit the word starts already marked in self.word_numbers from top to
+        # bottom, left to right; sorting the (row, col) keys gives that order
+        # without scanning every cell of the grid
+        W, H = self.width, self.height
+        for row, col in sorted(self.word_numbers):
+            # Skip starts outside the grid and on empty cells
+            if not (0 <= row < H and 0 <= col < W) or self._grid[row * W + col] == EMPTY:
+                continue
+
+            # This is a starting position for at least one word
+            numbered_positions[(row, col)] = current_number
+            current_number += 1
         
         # Replace the old word_numbers with the new numbered_positions
         self.word_numbers = numbered_positions
         
     def _fills_isolated_area(self, row, col, horizontal, length):
         """Check if a word placement would fill an isolated area in the grid."""
-        # Count empty cells around the proposed word placement
-        empty_neighbors = 0
-        filled_neighbors = 0
-        
-        # Check all cells that would be affected by this word
-        for i in range(length):
-            r = row if horizontal else row + i
-            c = col + i if horizontal else col
-            
-            # Ensure we're within grid bounds
-            if r >= self.height or c >= self.width:
-                # Out of bounds - can't place word here
+        W, H = self.width, self.height
+        if horizontal:
+            if not (0 <= row < H and 0 <= col and col + length <= W):
                 return False
-            
-            # Skip if this cell already has a letter (intersection)
-            if self.grid[r][c] != ' ':
-                continue
-                
-            # Check all 8 neighbors of this cell
-            for dr in [-1, 0, 1]:
-                for dc in [-1, 0, 1]:
-                    # Skip the cell itself
-                    if dr == 0 and dc == 0:
-                        continue
-                        
-                    # Check if neighbor is within grid bounds
-                    nr, nc = r + dr, c + dc
-                    if 0 <= nr < self.height and 0 <= nc < self.width:
-                        if self.grid[nr][nc] == ' ':
-                            empty_neighbors += 1
-                        else:
-                            filled_neighbors += 1
-        
-        # Word fills an isolated area if it has many filled neighbors and few empty ones
-        # This indicates it's filling a gap surrounded by existing words
-        return filled_neighbors >= length * 2 and empty_neighbors <= length * 3
+            return _fills_isolated_area(self._row_bits, W, row, col, length)
+        if not (0 <= col < W and 0 <= row and row + length <= H):
+            return False
+        return _fills_isolated_area(self._col_bits, H, col, row, length)
+
+    def _fill_gaps_with(self, words: List[str], max_attempts: int) -> bool:
+        """Place words from a list where they cross the grid, in list order.
+
+        Each round places the first word that fits anywhere and removes it
+        from words; rounds repeat until nothing fits, words runs out or
+        max_attempts words are placed. Returns False if it stopped because
+        none of the remaining words fit. Words are tried where they cross the
+        grid rather than in the empty runs ("gaps") between letters: a word
+        that exactly fills a gap covers empty cells only, so it either ends
+        against a letter or crosses nothing, and both are rejected.
+        """
+        W, H = self.width, self.height
+        grid, rows, cols = self._grid, self._row_bits, self._col_bits
+        attempts = 0
+        placed = True
+        while attempts < max_attempts and words:
+            placed = False
+            for index, word in enumerate(words):
+                # A crossing is required, so an accepted word always touches
+                # the existing words
+                wb = self._encode(word)
+                for row, col, horizontal in self._crossing_positions(word):
+                    if _can_place(grid, rows, cols, W, H, wb, row, col, horizontal, True) >= 0:
+                        self.place_word(word, row, col, horizontal)
+                        # Drop it by position; the list order is kept for the next round
+                        del words[index]
+                        placed = True
+                        break
+                if placed:
+                    break
+
+            if not placed:
+                break  # No more gap words could be placed
+            attempts += 1
+        return placed
 
     def fill_small_gaps(self):
-        """Fill small gaps in the grid with short words."""
-        # This is a simplified implementation of gap filling
-        # It looks for small 2-3 letter gaps and tries to fill them
-        short_words = [w for w in self.words if len(w) <= 3]
-        
-        # Try each position in the grid
-        for row in range(self.height):
-            for col in range(self.width):
-                # Try horizontal gaps
-                if col < self.width - 1 and self.grid[row][col] == ' ' and self.grid[row][col+1] == ' ':
-                    # Found a potential horizontal gap, check length
-                    gap_length = 0
-                    for i in range(col, self.size):
-                        if self.grid[row][i] == ' ':
-                            gap_length += 1
-                        else:
-                            break
-                            
-                    if 2 <= gap_length <= 3:  # Small gap that can be filled
-                        # Try to find a word that fits
-                        for word in short_words:
-                            if len(word) == gap_length and self.can_place_word(word, row, col, True):
-                                self.place_word(word, row, col, True)
-                                break
-                
-                # Try vertical gaps
-                if row < self.height - 1 and self.grid[row][col] == ' ' and self.grid[row+1][col] == ' ':
-                    # Found a potential vertical gap, check length
-                    gap_length = 0
-                    for i in range(row, self.height):
-                        if self.grid[i][col] == ' ':
-                            gap_length += 1
-                        else:
-                            break
-                            
-                    if 2 <= gap_length <= 3:  # Small gap that can be filled
-                        # Try to find a word that fits
-                        for word in short_words:
-                            if len(word) == gap_length and self.can_place_word(word, row, col, False):
-                                self.place_word(word, row, col, False)
-                                break
-    
-    def generate_puzzle(self, fill_gaps=True) -> Tuple[List[List[dict]], List[str], List[str], List[List[str]]]:
-        """Generate crossword puzzle with proper grid structure and clues."""
+        """Fill small gaps in the grid with short words.
+
+        A gap is the run of empty cells from a position up to the next
+        letter or the grid edge. A word that exactly fills one covers empty
+        cells only, so once any word is placed it crosses nothing and
+        can_place_word() rejects it; only an empty grid can take a gap word,
+        and then just the first one.
+        """
+        if self.placed_words:
+            return
+        # Words of the last filter_words() result, by length
+        by_len = self.words_by_len
+        W, H = self.width, self.height
+        # Never place a word twice; place_word keeps this set current
+        placed = self.placed_word_set
+
+        # Index the 2-3 cell gaps from the occupancy bits: a gap of length L
+        # starts where L cells are empty and the next one is a letter or the edge
+        gaps = []
+        for across, lines, size in ((True, self._row_bits, W), (False, self._col_bits, H)):
+            for line, bits in enumerate(lines):
+                stops = bits | 1 << size
+                filled = bits | bits >> 1
+                for length in (2, 3):
+                    starts = stops >> length & ~filled
+                    while starts:
+                        low = starts & -starts
+                        pos = low.bit_length() - 1
+                        gaps.append((line, pos, 0, length) if across else (pos, line, 1, length))
+                        starts ^= low
+                    filled |= bits >> length
+
+        # In reading order, across before down at the same cell
+        for row, col, down, length in sorted(gaps):
+            # Try to find a word that fits
+            for word in by_len.get(length, ()):
+                if word in placed:
+                    continue
+                if self.can_place_word(word, row, col, not down):
+                    self.place_word(word, row, col, not down)
+                    return
+
+    def generate_puzzle(self, fill_gaps=True, first_word: Optional[str] = None) -> Tuple[List[List[dict]], List[str], List[str], List[List[str]]]:
+        """Generate crossword puzzle with proper grid structure and clues.
+
+        first_word, if given, is placed in the middle instead of the first
+        5-9 letter word of the filtered list.
+        """
         # Reset grid and counters
-        self.grid = [[' ' for _ in range(self.width)] for _ in range(self.height)]
+        W, H = self.width, self.height
+        self._grid = grid = bytearray(b' ' * (W * H))
+        self._row_bits = [0] * H
+        self._col_bits = [0] * W
+        self._row_version = [0] * (H + 2)
+        self._col_version = [0] * (W + 2)
         self.placed_words = []
+        self.placed_word_set = set()
+        self.occupied_cells = []
+        self._history = []
         self.word_numbers = {}
 
         valid_words = self.filter_words()
@@ -470,12 +889,12 @@ class CrosswordGenerator:
             raise ValueError("No valid words found for the specified language")
 
         # Try to find a suitable first word (5-9 letters)
-        first_word = None
-        for word in valid_words:
-            if 5 <= len(word) <= 9:
-                first_word = word
-                break
-        
+        if not first_word:
+            for word in valid_words:
+                if 5 <= len(word) <= 9:
+                    first_word = word
+                    break
+
         if not first_word:
             first_word = valid_words[0]  # Fallback to first word if no suitable word found
 
@@ -486,263 +905,69 @@ class CrosswordGenerator:
 
         # First phase: Place medium and long words to create structure
         # Try to place remaining words by finding intersections
-        attempts = 0
         max_attempts = 300  # Increased attempts for maximum density
         max_words = min(80, len(valid_words) // 2)  # Significantly increased word limit for maximum density
-        
-        while attempts < max_attempts and len(self.placed_words) < max_words:
-            best_placement = None
-            best_score = -1
-            best_word = None
 
-            # Try each remaining word
-            for word in valid_words:
-                if word in [w[0] for w in self.placed_words]:
-                    continue
-                    
-                # For the first phase, prefer medium-length words, but allow more short words
-                if len(self.placed_words) < 10 and len(word) < 3:
-                    continue  # Only skip very short (3-letter) words in the very beginning
-
-                # Try all possible positions
-                for row in range(self.height):
-                    for col in range(self.width):
-                        for horizontal in [True, False]:
-                            if self.can_place_word(word, row, col, horizontal):
-                                # Count intersections
-                                intersections = 0
-                                for i in range(len(word)):
-                                    r = row if horizontal else row + i
-                                    c = col + i if horizontal else col
-                                    if self.grid[r][c] == word[i]:
-                                        intersections += 1
-                                
-                                # Score based on intersections and position
-                                score = intersections * 10
-                                # Prefer positions in the middle 60% of the grid
-                                if self.size * 0.2 <= row <= self.size * 0.8 and self.size * 0.2 <= col <= self.size * 0.8:
-                                    score += 5
-                                # Extra points for perfect intersections (not just touching)
-                                if intersections > 1:
-                                    score += 10
-                                    
-                                # Bonus for filling gaps (more points for shorter words)
-                                if len(self.placed_words) >= 10 and len(word) <= 4:
-                                    score += 25 - (len(word) * 4)  # Even more aggressive bonus for shorter words
-                                    
-                                # Extra bonus for 3-letter words after initial structure is built
-                                if len(self.placed_words) >= 15 and len(word) == 3:
-                                    score += 15  # Increased bonus for 3-letter words to fill small gaps
-                                    
-                                # Additional bonus for words that fill isolated areas
-                                if self._fills_isolated_area(row, col, horizontal, len(word)):
-                                    score += 20  # Significant bonus for filling isolated areas
-                                
-                                if score > best_score:
-                                    best_score = score
-                                    best_placement = (word, row, col, horizontal)
-                                    best_word = word
-
-            # Place the best word found
-            if best_placement:
-                word, row, col, horizontal = best_placement
-                self.place_word(word, row, col, horizontal)
-            else:
-                break
+        # Each word once, in valid_words order, indexed by its letters
+        candidates = [(word, self._encode(word)) for word in dict.fromkeys(valid_words)]
+        by_letter = build_letter_index(wb for _, wb in candidates)
+        self._search(candidates, by_letter, max_words, max_attempts)
 
-            attempts += 1
-            
         # Second phase: Fill small gaps with short words
         # Specifically look for small gaps that can be filled
         if len(valid_words) > len(self.placed_words):
-            # Get short words that haven't been placed yet
-            short_words = [w for w in valid_words if len(w) <= 4 and w not in [placed[0] for placed in self.placed_words]]
-            
-            # Try to place short words in gaps
-            gap_filling_attempts = 0
-            max_gap_attempts = 250  # Increased from 150 to 250 for maximum gap filling
-            
+            # Short words that haven't been placed yet, shortest first, built once
+            short_words = [w for length in (3, 4) for w in self.words_by_len.get(length, ())
+                           if w not in self.placed_word_set]
             # No limit on words for gap filling - try to fill as many gaps as possible
-            while gap_filling_attempts < max_gap_attempts and short_words:
-                placed_gap_word = False
-                
-                # Find gaps in the grid
-                gaps = []
-                for row in range(self.height):
-                    for col in range(self.width):
-                        # Look for horizontal gaps
-                        if col < self.width - 2:  # Need at least 3 cells for a word
-                            # Check if we have a potential horizontal gap
-                            if self.grid[row][col] == ' ':
-                                # Look for the length of this gap
-                                gap_length = 0
-                                for i in range(col, self.width):
-                                    if self.grid[row][i] == ' ':
-                                        gap_length += 1
-                                    else:
-                                        break
-                                
-                                if 3 <= gap_length <= 4:  # Good size for short words
-                                    gaps.append((row, col, True, gap_length))
-                        
-                        # Look for vertical gaps
-                        if row < self.height - 2:  # Need at least 3 cells for a word
-                            # Check if we have a potential vertical gap
-                            if self.grid[row][col] == ' ':
-                                # Look for the length of this gap
-                                gap_length = 0
-                                for i in range(row, self.height):
-                                    if self.grid[i][col] == ' ':
-                                        gap_length += 1
-                                    else:
-                                        break
-                                
-                                if 3 <= gap_length <= 4:  # Good size for short words
-                                    gaps.append((row, col, False, gap_length))
-                
-                # Sort gaps by size (smaller first)
-                gaps.sort(key=lambda x: x[3])
-                
-                # Try to fill each gap with a word of matching length
-                for gap_row, gap_col, horizontal, gap_length in gaps:
-                    # Find words that match the gap length
-                    matching_words = [w for w in short_words if len(w) == gap_length]
-                    
-                    if not matching_words:
-                        continue
-                    
-                    # Try each matching word
-                    for word in matching_words:
-                        if self.can_place_word(word, gap_row, gap_col, horizontal):
-                            # Check if it intersects with existing words
-                            intersects = False
-                            for i in range(len(word)):
-                                r = gap_row if horizontal else gap_row + i
-                                c = gap_col + i if horizontal else gap_col
-                                if self.grid[r][c] != ' ' and self.grid[r][c] == word[i]:
-                                    intersects = True
-                                    break
-                            
-                            # Place the word if it can intersect or is adjacent to existing words
-                            if intersects or self._has_adjacent_words(gap_row, gap_col, horizontal, len(word)):
-                                self.place_word(word, gap_row, gap_col, horizontal)
-                                short_words.remove(word)
-                                placed_gap_word = True
-                                break
-                    
-                    if placed_gap_word:
-                        break
-                
-                # If we couldn't fill any gaps with exact matches, try more flexible placement
-                if not placed_gap_word:
-                    # Try each short word
-                    for word in sorted(short_words, key=len):
-                        if placed_gap_word:
-                            break
-                            
-                        # Try all possible positions
-                        for row in range(self.size):
-                            for col in range(self.size):
-                                for horizontal in [True, False]:
-                                    if self.can_place_word(word, row, col, horizontal):
-                                        # Check if it intersects or is adjacent to existing words
-                                        if self._has_adjacent_words(row, col, horizontal, len(word)):
-                                            self.place_word(word, row, col, horizontal)
-                                            short_words.remove(word)
-                                            placed_gap_word = True
-                                            break
-                                            
-                                if placed_gap_word:
-                                    break
-                                    
-                            if placed_gap_word:
-                                break
-                
-                if not placed_gap_word:
-                    break  # No more gap words could be placed
-                    
-                gap_filling_attempts += 1
-                
-        # Third phase: Try to fill any remaining gaps with very short words (3 letters)
-        if len(valid_words) > len(self.placed_words):
-            # Get very short words that haven't been placed yet
-            very_short_words = [w for w in valid_words if len(w) == 3 and w not in [placed[0] for placed in self.placed_words]]
-            
-            # Try to place these words in any remaining small gaps
-            final_gap_attempts = 0
-            while final_gap_attempts < 200 and very_short_words:  # Doubled from 100 to 200 attempts
-                placed_word = False
-                
-                # Try each very short word
-                for word in very_short_words:
-                    if placed_word:
-                        break
-                        
-                    # Try all possible positions
-                    for row in range(self.size):
-                        for col in range(self.size):
-                            for horizontal in [True, False]:
-                                if self.can_place_word(word, row, col, horizontal):
-                                    # Only place if it's adjacent to existing words
-                                    if self._has_adjacent_words(row, col, horizontal, len(word)):
-                                        self.place_word(word, row, col, horizontal)
-                                        very_short_words.remove(word)
-                                        placed_word = True
-                                        break
-                                        
-                            if placed_word:
-                                break
-                                
-                        if placed_word:
-                            break
-                            
-                if not placed_word:
-                    break
-                    
-                final_gap_attempts += 1
+            more_may_fit = self._fill_gaps_with(short_words, 250)  # Increased from 150 to 250 for maximum gap filling
+        else:
+            more_may_fit = False
+
+        # Third phase: Try to fill any remaining gaps with very short words (3 letters).
+        # Its words are the unplaced 3-letter words phase 2 was still trying, so it
+        # only has a chance if phase 2 ran out of rounds rather than of fits
+        if more_may_fit and len(valid_words) > len(self.placed_words):
+            # Get very short words that haven't been placed yet, each once
+            very_short_words = [w for w in self.words_by_len.get(3, ()) if w not in self.placed_word_set]
+            self._fill_gaps_with(very_short_words, 200)  # Doubled from 100 to 200 attempts
 
-        # Try to place remaining words
-        for word in valid_words[1:]:
+        # Try to place remaining words; the set is checked as the loop runs,
+        # so words placed by it (or listed twice) are not tried again.
+        # Placements are checked with _can_place directly, each word encoded
+        # once; place_word updates the grid and bit lists in place
+        grid, rows, cols = self._grid, self._row_bits, self._col_bits
+        for word in (w for w in valid_words[1:] if w not in self.placed_word_set):
             if len(self.placed_words) >= 60:  # Increased from 35 to 60 words total
                 break
                 
             placed = False
+            wb = self._encode(word)
+            # Offsets of each letter in the word, so crossings are looked up
+            # instead of comparing every letter pair
+            letter_offsets = {}
+            for j, letter in enumerate(word):
+                letter_offsets.setdefault(letter, []).append(j)
+            offsets_of = letter_offsets.get
+
             # Try to intersect with existing words
-            for placed_word in self.placed_words:
+            for w, r, c, h, _ in self.placed_words:
+                # Offsets in the new word of each letter of the placed word;
+                # a horizontal word is crossed vertically and vice versa
+                for i, offsets in enumerate(map(offsets_of, w)):
+                    if not offsets:
+                        continue
+                    for j in offsets:
+                        new_row, new_col = (r - j, c + i) if h else (r + i, c - j)
+                        # Check if placement is valid
+                        if _can_place(grid, rows, cols, W, H, wb, new_row, new_col, not h, True) >= 0:
+                            self.place_word(word, new_row, new_col, not h)
+                            placed = True
+                            break
+                    if placed:
+                        break
                 if placed:
                     break
-                    
-                # Unpack the placed word tuple (word, row, col, horizontal, hint)
-                w, r, c, h = placed_word[0], placed_word[1], placed_word[2], placed_word[3]
-                
-                # Try to find a letter in the new word that matches a letter in the placed word
-                if h:  # If placed word is horizontal, try vertical placement
-                    for i in range(len(w)):
-                        for j in range(len(word)):
-                            if w[i].lower() == word[j].lower():
-                                # Calculate position for vertical placement
-                                new_row = r - j
-                                new_col = c + i
-                                
-                                # Check if placement is valid
-                                if self.can_place_word(word, new_row, new_col, False):
-                                    self.place_word(word, new_row, new_col, False)
-                                    placed = True
-                                    break
-                        if placed:
-                            break
-                else:  # If placed word is vertical, try horizontal placement
-                    for i in range(len(w)):
-                        for j in range(len(word)):
-                            if w[i].lower() == word[j].lower():
-                                # Calculate position for horizontal placement
-                                new_row = r + i
-                                new_col = c - j
-                                
-                                # Check if placement is valid
-                                if self.can_place_word(word, new_row, new_col, True):
-                                    self.place_word(word, new_row, new_col, True)
-                                    placed = True
 
         # Fill in any remaining gaps with short words
         if fill_gaps:
@@ -751,56 +976,90 @@ class CrosswordGenerator:
         # Assign numbers in reading order (top-to-bottom, left-to-right)
         self.assign_numbers_in_reading_order()
 
+        # Decode the flat grid once into rows of letters; this is also the answer key
+        answer_grid = self.grid
+
+        # Clue numbers by flat cell index, so the cells below are filled
+        # row by row without a (row, col) lookup each
+        numbers = [None] * (W * H)
+        for (row, col), number in self.word_numbers.items():
+            numbers[row * W + col] = number
+
         # Generate grid representation with cell details
-        grid_data = []
-        across_words = []
-        down_words = []
-        across_hints = []
-        down_hints = []
-        answer_grid = [[' ' for _ in range(self.width)] for _ in range(self.height)]
-
-        # Copy the filled grid to answer grid
-        for row in range(self.height):
-            for col in range(self.width):
-                answer_grid[row][col] = self.grid[row][col]
-
-        # Create grid with cell information and collect clues
-        for row in range(self.height):
-            grid_row = []
-            for col in range(self.width):
-                cell = {
-                    'letter': self.grid[row][col],
-                    'number': self.word_numbers.get((row, col), None),
-                    'empty': self.grid[row][col] == ' '
-                }
-                grid_row.append(cell)
-            grid_data.append(grid_row)
-
-        # Generate clues and hints
+        grid_data = [
+            [{'letter': letter, 'number': number, 'empty': letter == ' '}
+             for letter, number in zip(letters, numbers[row * W:(row + 1) * W])]
+            for row, letters in enumerate(answer_grid)
+        ]
+
+        # Generate clues and hints, keyed by clue number for sorting
+        across = []
+        down = []
         for placed_word in self.placed_words:
             # Unpack the placed word tuple safely
             if len(placed_word) >= 5:  # Make sure we have all components
                 word, row, col, horizontal, hint = placed_word
                 number = self.word_numbers.get((row, col))
                 if number:
-                    if horizontal:
-                        across_words.append(f"{number}. {'_' * len(word)}")
-                        across_hints.append(f"{number}. {hint}")
-                    else:
-                        down_words.append(f"{number}. {'_' * len(word)}")
-                        down_hints.append(f"{number}. {hint}")
-
-        # Sort clues and hints by number
-        def sort_by_number(item):
-            return int(item.split('.')[0])
-            
-        across_words.sort(key=sort_by_number)
-        down_words.sort(key=sort_by_number)
-        across_hints.sort(key=sort_by_number)
-        down_hints.sort(key=sort_by_number)
+                    clues = across if horizontal else down
+                    clues.append((number, f"{number}. {'_' * len(word)}", f"{number}. {hint}"))
+
+        # Sort clues and hints by number; the sort is stable, so equal numbers keep placement order
+        across.sort(key=lambda clue: clue[0])
+        down.sort(key=lambda clue: clue[0])
+        across_words = [clue for _, clue, _ in across]
+        across_hints = [hint for _, _, hint in across]
+        down_words = [clue for _, clue, _ in down]
+        down_hints = [hint for _, _, hint in down]
 
         return grid_data, across_words, down_words, across_hints, down_hints, answer_grid
 
+    def generate_puzzle_parallel(self, n_workers: Optional[int] = None, fill_gaps=True):
+        """Generate puzzles from several first words in parallel and keep the fullest.
+
+        Each worker process builds its own generator with the same words,
+        hints and seed, starting from a different 5-9 letter word. The grid
+        with the most placed words wins (ties go to the earlier first word)
+        and is adopted by this generator. Returns the same tuple as
+        generate_puzzle().
+        """
+        n_workers = n_workers or os.cpu_count() or 1
+        valid_words = self.filter_words()
+        if not valid_words:
+            raise ValueError("No valid words found for the specified language")
+        first_words = [w for w in dict.fromkeys(valid_words[:n_workers * 4]) if 5 <= len(w) <= 9]
+        first_words = first_words[:n_workers] or [None]
+
+        # Pickled once per job; words and hints are read-only in the workers
+        words = frozenset(self.words)
+        settings = (self.width, self.height, self.language, self.seed, words, self.word_hints, fill_gaps)
+        best = None
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(first_words))) as executor:
+            futures = {executor.submit(_generate_from_first_word, settings, word): i
+                       for i, word in enumerate(first_words)}
+            for future in as_completed(futures):
+                key = (len(future.result()[1]), -futures[future])
+                if best is None or key > best[0]:
+                    best = (key, future.result())
+
+        result, self.placed_words, grid, self.word_numbers = best[1]
+        self.placed_word_set = {placed[0] for placed in self.placed_words}
+        self._grid = bytearray(grid)
+        self._sync_bits()
+        self._history = []
+        W = self.width
+        self.occupied_cells = [(i // W, i % W, letter) for i, letter in enumerate(grid) if letter != EMPTY]
+        return result
+
+def _generate_from_first_word(settings, first_word):
+    """Process pool worker for generate_puzzle_parallel()."""
+    width, height, language, seed, words, word_hints, fill_gaps = settings
+    generator = CrosswordGenerator(width=width, height=height, language=language, seed=seed)
+    generator.words = words
+    generator.word_hints = word_hints
+    result = generator.generate_puzzle(fill_gaps=fill_gaps, first_word=first_word)
+    return result, generator.placed_words, bytes(generator._grid), generator.word_numbers
+
 def main():
     parser = argparse.ArgumentParser(description='Generate a crossword puzzle')
     parser.add_argument('--size', type=int, default=15, help='Grid size')
@@ -810,6 +1069,8 @@ def main():
     parser.add_argument('--theme', help='Optional theme for word selection')
     parser.add_argument('--difficulty', choices=['easy', 'medium', 'hard'],
                       default='medium', help='Puzzle difficulty')
+    parser.add_argument('--workers', type=int, default=1,
+                      help='Try this many first words in parallel and keep the fullest grid')
 
     args = parser.parse_args()
 
@@ -822,7 +1083,12 @@ def main():
     )
 
     try:
-        grid, across, down, across_hints, down_hints, answer_key = generator.generate_puzzle()
+        generator.load_words()
+        if args.workers > 1:
+            result = generator.generate_puzzle_parallel(args.workers)
+        else:
+            result = generator.generate_puzzle()
+        grid, across, down, across_hints, down_hints, answer_key = result
         
         print("\nCrossword Grid:")
         print(grid)
@@ -1,12 +1,29 @@
 
+import mmap
+import os
 import random
 
 file_path = 'finnish_words_with_hints.txt'
+tmp_path = file_path + '.tmp'
 
-with open(file_path, 'r', encoding='utf-8') as f:
-    lines = f.readlines()
+with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+    # Start offset of every line; the lines themselves stay in the mapped file
+    starts = [0]
+    end = mm.find(b'\n')
+    while end >= 0:
+        starts.append(end + 1)
+        end = mm.find(b'\n', end + 1)
+    if starts[-1] < len(mm):
+        starts.append(len(mm))  # Last line without a newline
 
-random.shuffle(lines)
+    spans = list(zip(starts, starts[1:]))
+    random.shuffle(spans)
 
-with open(file_path, 'w', encoding='utf-8') as f:
-    f.writelines(lines)
+    # Copy the lines out in shuffled order, then swap the file in
+    with open(tmp_path, 'wb', buffering=1 << 17) as out:
+        for start, stop in spans:
+            out.write(mm[start:stop])
+            if mm[stop - 1] != ord('\n'):
+                out.write(b'\n')
+
+os.replace(tmp_path, file_path)
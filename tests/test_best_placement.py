@@ -0,0 +1,54 @@
+"""The good-enough cutoff of _best_placement stops scoring grid lines early."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crossword_generator import CrosswordGenerator, _best_placement, build_letter_index
+
+WORDS = ['kala', 'talo', 'sana', 'kissa', 'koira', 'auto', 'katu', 'lasi',
+         'tuoli', 'omena', 'ikkuna', 'sakset', 'ovi', 'uni', 'kuu', 'aika']
+
+
+@pytest.fixture
+def grid():
+    generator = CrosswordGenerator(size=10, seed=0)
+    generator.place_word('ikkuna', 4, 2, True)
+    generator.place_word('kissa', 3, 3, False)
+    candidates = [(word, generator._encode(word)) for word in WORDS]
+    by_letter = build_letter_index(wb for _, wb in candidates)
+    skip = {WORDS.index(word) for word in generator.placed_word_set}
+
+    def best(good_enough, cache):
+        return _best_placement(generator._grid, generator._row_bits, generator._col_bits,
+                               generator.width, generator.height, generator.size,
+                               candidates, by_letter, skip, len(generator.placed_words),
+                               cache=cache, good_enough=good_enough)
+    return best
+
+
+def test_without_cutoff_every_line_is_scored(grid):
+    cache = {}
+    assert grid(None, cache) is not None
+    assert len(cache) == 10 + 10
+
+
+def test_cutoff_returns_first_line_reaching_it(grid):
+    full = grid(None, {})
+    cache = {}
+    found = grid(0, cache)
+    assert found[0] <= full[0]
+    assert len(cache) < 10 + 10  # The remaining lines were not scored
+
+
+def test_cutoff_result_reaches_the_score(grid):
+    full = grid(None, {})
+    found = grid(full[0], {})
+    assert found[0] >= full[0]
+
+
+def test_unreachable_cutoff_gives_the_full_result(grid):
+    full = grid(None, {})
+    assert grid(full[0] + 1, {}) == full
@@ -0,0 +1,34 @@
+"""A seeded puzzle must not depend on the hash seed of the process."""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+GENERATE = """
+import json
+from crossword_generator import CrosswordGenerator
+import app
+
+words, word_hints = app.load_wordlist({language!r})
+generator = CrosswordGenerator(width=15, height=15, language={language!r}, seed=42)
+generator.words = words
+generator.word_hints = word_hints
+grid, across, down, across_hints, down_hints, answer_key = generator.generate_puzzle()
+print(json.dumps([answer_key, across, down, across_hints, down_hints]))
+"""
+
+
+def _generate(language, hash_seed):
+    env = dict(os.environ, PYTHONHASHSEED=str(hash_seed))
+    result = subprocess.run([sys.executable, '-c', GENERATE.format(language=language)],
+                            cwd=REPO, env=env, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+@pytest.mark.parametrize('language', ['fi', 'no', 'both'])
+def test_same_puzzle_across_hash_seeds(language):
+    assert _generate(language, 1) == _generate(language, 2)
@@ -1,10 +1,13 @@
-from app import app
-import multiprocessing
+from app import app, WEB_WORKERS
 
-# Calculate workers based on CPU count
-workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = 'sync'
-worker_connections = 1000
+# One worker per CPU unless WEB_CONCURRENCY says otherwise: generation is
+# CPU-bound Python, so extra processes only compete for cores. Each worker
+# serves a few requests at once on threads, so cached puzzles and /result
+# polls are not stuck behind a running generation. app sizes the
+# /generate_async pool of each worker from the same number
+workers = WEB_WORKERS
+worker_class = 'gthread'
+threads = 4
 timeout = 120  # 2 minutes
 keepalive = 5
 